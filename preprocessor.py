@@ -1,7 +1,38 @@
 import os
 import json
+import mmap
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import orjson # optional: faster parsing and serialization
+except ImportError:
+    orjson = None
+
+try:
+    import ijson # optional: incremental parsing of large files
+except ImportError:
+    ijson = None
+
+_YES: set[str] = {'y', 'yes'}
+_NO: set[str] = {'n', 'no'}
+
+# Image paths are shared by many objects, so they are normalized only once.
+# These are module-level functions because lru_cache on a method would keep `self` alive.
+
+def _path_parts(path: str) -> list[str]:
+    # Like pathlib, drops '.' and empty segments; backslashes are treated as separators too.
+    return [p for p in path.replace('\\', '/').split('/') if p not in ('.', '')]
+
+@lru_cache(maxsize=4096)
+def _rel_path(path: str) -> str:
+    return '/'.join(p for p in _path_parts(path) if p != '..') or '.'
+
+@lru_cache(maxsize=4096)
+def _same_path(path: str) -> str:
+    root: str = '/' if path.startswith('/') else ''
+    return root + '/'.join(_path_parts(path)) or '.'
+
 class TiledPreProcessor:
     """
     Class responsible for processing JSON files exported from the Tiled Map Editor.
@@ -25,81 +56,73 @@ class TiledPreProcessor:
         self.image_origin_correction: bool = image_origin_correction
         self.return_image_relative_path: bool = return_image_relative_path
 
-        self.abs_path: str = os.path.join(os.getcwd(), rel_file_path)
+        self.abs_path: str = os.path.abspath(rel_file_path)
         self.layers: dict = dict()
 
-    def _extract_dots(self, object: dict, key: str) -> list[list]:
-        origin_dot: list = [object['x'], object['y']]
-        dots: list = list()
-
-        for i in range(len(object[key])):
-            new_dot: list = [origin_dot[0] + object[key][i]['x'], origin_dot[1] + object[key][i]['y']]
-            dots.append(new_dot)
+        self._gid_images: dict[int, str] = dict()
 
-        return dots
+    def _extract_dots(self, obj: dict, points: list[dict]) -> list[tuple]:
+        # Dots are kept as tuples, which are smaller than lists and are still written as JSON arrays.
+        origin_x, origin_y = obj['x'], obj['y']
+        return [(origin_x + point['x'], origin_y + point['y']) for point in points]
 
-    def _process_objects(self, data: dict, name: str, lyr_i: int, obj_i: int) -> None:
-        obj: dict = data['layers'][lyr_i]['objects'][obj_i] # for better comprehension
-        self.layers[name][obj_i]['name'] = obj['name']
-        self.layers[name][obj_i]['width'] = obj['width']
-        self.layers[name][obj_i]['height'] = obj['height']
+    def _build_plain(self, obj: dict) -> dict:
+        points: list[dict] | None = obj.get('polyline')
+        if points is None:
+            points = obj.get('polygon')
 
-        if 'polyline' in obj:
-            self.layers[name][obj_i]['dots'] = self._extract_dots(obj, 'polyline')
-        elif 'polygon' in obj:
-            self.layers[name][obj_i]['dots'] = self._extract_dots(obj, 'polygon')
+        if points is not None:
+            processed: dict = {'name': obj['name'], 'width': obj['width'], 'height': obj['height'], 'dots': self._extract_dots(obj, points)}
         else:
-            self.layers[name][obj_i]['x'] = obj['x']
-            self.layers[name][obj_i]['y'] = obj['y']
+            processed = {'name': obj['name'], 'width': obj['width'], 'height': obj['height'], 'x': obj['x'], 'y': obj['y']}
 
         # You can add any further information you feel is necessary to collect by referencing the corresponding key.
         # e.g.:
         #
         # if obj['type'] != '':
-        #     self.layers[name][obj_i]['type'] = obj['type']
-
-    def _process_images(self, data: dict, name: str, lyr_i: int, obj_i: int, gid: int) -> None:
-        obj: dict = data['layers'][lyr_i]['objects'][obj_i] # for better comprehension
-        self.layers[name][obj_i]['x'] = obj['x']
-        self.layers[name][obj_i]['y'] = obj['y'] - obj['height'] if self.image_origin_correction else obj['y']
-        self.layers[name][obj_i]['image'] = self._get_image(data, gid)
-
-    def _rel_path(self, path: str) -> str | None:
-        parts: list[str] = path.split('/')
-        temp_list: list[str] = [p for p in parts  if p != '..']
-        return Path(os.path.join(*temp_list)).as_posix()
-
-    def _same_path(self, path: str) -> str | None:
-        return Path(path).as_posix()
-
-    def _image_path(self, data: dict, gid: int, i: int) -> str | None:
-        for img in data['tilesets'][i]['tiles']:
-            if img['id'] == gid - data['tilesets'][i]['firstgid']:
-                path: str | None = self._rel_path(img['image']) if self.return_image_relative_path else self._same_path(img['image'])
-                return path
-            
-        return None
-
-    def _get_image(self, data: dict, gid: int) -> str:
-        for i in range(len(data['tilesets'])):
-
-            # Searching for the right tileset:
-            # - firstgid <= gid < firstgid of the next tileset
-            # - tileId = gid - firstgid
-
-            if data['tilesets'][i]['firstgid'] <= gid:
-                if i != len(data['tilesets']) - 1:
-                    if i != len(data['tilesets']) - 1 and gid < data['tilesets'][i + 1]['firstgid']:
-                        return self._image_path(data, gid, i)
-                else:
-                    return self._image_path(data, gid, i)
-
-
-    def read_data_file(self) -> None:
+        #     processed['type'] = obj['type']
+
+        return processed
+
+    def _build_image(self, obj: dict) -> dict:
+        return {
+            'x': obj['x'],
+            'y': obj['y'] - obj['height'] if self.image_origin_correction else obj['y'],
+            'image': self._get_image(obj['gid'])
+        }
+
+    def _process_layer(self, lyr: dict) -> list[dict]:
+        return [self._build_image(obj) if 'gid' in obj else self._build_plain(obj) for obj in lyr['objects']]
+
+    def _index_tilesets(self, tilesets: list[dict]) -> None:
+        # Every tile's global id is mapped straight to its image (gid = firstgid + tileId),
+        # so finding an object's image is a single dict lookup.
+        # Tiles without an image (e.g. spritesheet tiles that only carry properties or collisions) are skipped.
+        self._gid_images = {ts['firstgid'] + tile['id']: tile['image'] for ts in tilesets for tile in ts.get('tiles', ()) if 'image' in tile}
+
+    def _get_image(self, gid: int) -> str | None:
+        image: str | None = self._gid_images.get(gid)
+        if image is None:
+            return None
+
+        return _rel_path(image) if self.return_image_relative_path else _same_path(image)
+
+    def _read_streamed(self) -> None:
+        # Tiled writes 'tilesets' after 'layers', so the tilesets are collected in a first pass
+        # and the layers are then processed one at a time in a second pass.
+        with open(self.abs_path, mode='rb') as file:
+            self._index_tilesets(list(ijson.items(file, 'tilesets.item', use_float=True)))
+            file.seek(0)
+
+            for lyr in ijson.items(file, 'layers.item', use_float=True):
+                self.layers[lyr['name']] = self._process_layer(lyr)
+
+
+    def read_data_file(self, stream: bool = False) -> None:
         """
         Reads the JSON file and extracts the data from all layers and objects.
 
-        Objects of the 'polyline' and 'polygon' types have their points converted to lists of absolute coordinates.
+        Objects of the 'polyline' and 'polygon' types have their points converted to (x, y) tuples of absolute coordinates.
         Simple objects directly store the 'x' and 'y' coordinates, as well as width and height.
 
         The result is stored in the `self.layers` attribute with the following structure:
@@ -109,7 +132,7 @@ class TiledPreProcessor:
                         "name": str,
                         "width": float,
                         "height": float,
-                        "dots": [[x1, y1], [x2, y2], ...] | opcional
+                        "dots": [(x1, y1), (x2, y2), ...] | opcional
                         "x": float,
                         "y": float
                     },
@@ -117,25 +140,33 @@ class TiledPreProcessor:
                 ],
                 ...
             }
-        """
 
-        with open(self.abs_path, mode='r', encoding='utf-8') as file: data = json.load(file)
+        Args:
+            stream (bool, optional): Parses the file incrementally with ijson, one layer at a time, instead of loading
+                the whole file into memory. Slower, but recommended for very large maps. Requires `pip install ijson`.
+        """
 
-        for i in range(len(data['layers'])):
-            lyr_name: str = data['layers'][i]['name']
-            self.layers[lyr_name] = list()
+        if stream:
+            if ijson is None:
+                raise ModuleNotFoundError('Streaming requires the "ijson" package: pip install ijson')
+            self._read_streamed()
+            return
 
-            for j in range(len(data['layers'][i]['objects'])):
-                self.layers[lyr_name].append(dict())
+        with open(self.abs_path, mode='rb') as file:
+            if orjson and os.fstat(file.fileno()).st_size: # an empty file cannot be memory-mapped
+                # orjson parses straight from the memory-mapped file, without copying it into a bytes object first
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                    data: dict = orjson.loads(view)
+            else:
+                raw: bytes = file.read()
+                data = orjson.loads(raw) if orjson else json.loads(raw)
+        self._index_tilesets(data.get('tilesets', []))
 
-                if 'gid' in data['layers'][i]['objects'][j]:
-                    gid: int = data['layers'][i]['objects'][j]['gid']
-                    self._process_images(data, lyr_name, i, j, gid)
-                else:
-                    self._process_objects(data, lyr_name, i, j)
+        for lyr in data['layers']:
+            self.layers[lyr['name']] = self._process_layer(lyr)
 
 
-    def store_data(self, name: str, destiny: str = os.path.dirname(os.path.abspath(__file__))) -> None:
+    def store_data(self, name: str, destiny: str = os.path.dirname(os.path.abspath(__file__)), indent: int | None = None) -> None:
         """
         Stores the processed data (self.layers) in a new JSON file.
 
@@ -144,38 +175,40 @@ class TiledPreProcessor:
         Args:
             name (str): Name of the output file (no extension).
             destiny (str, optional): Relative path to the folder where the file will be saved.
+            indent (int | None, optional): Indentation of the output file. By default the JSON is written compactly;
+                pass e.g. `indent=2` for a human-readable file (with orjson, any indentation is written as 2 spaces).
         """
 
-        path: str = Path(os.path.join(os.getcwd(), Path(destiny), f'{name}.json')).as_posix()
+        path: str = (Path.cwd() / destiny / f'{name}.json').as_posix()
         
         def reply_loop() -> str | None:
-            loop = True
-            while loop:
-                reply: str = input('Do you want to replace the file? [ y | n ] ')
+            while True:
+                reply: str = input('Do you want to replace the file? [ y | n ] ').strip().casefold()
 
-                if reply == 'n' or reply == 'N':
+                if reply in _NO:
                     print('End of processing.')
-                    loop = False
                     return 'END_PROGRAM'
-                elif reply == 'y' or reply == 'Y':
-                    loop = False
+                if reply in _YES:
                     return
-                else:
-                    print('\n')
 
-        try:
-            open(path, 'x') # creates a new file
+                print('\n')
 
-        except FileExistsError:
-            print(f'The file "{name}" already exists.')
-            if reply_loop() == 'END_PROGRAM': return
-                
-        except FileNotFoundError:
+        if not os.path.isdir(os.path.dirname(path)):
             print(f'The path you entered was not found: {path}\nThe program has been terminated.')
             return
-        
+
+        if os.path.exists(path):
+            print(f'The file "{name}" already exists.')
+            if reply_loop() == 'END_PROGRAM': return
+
         try:
-            with open(path, 'w', encoding='utf-8') as file: json.dump(self.layers, file, indent=2) # you can change the indentation
+            if orjson:
+                output: bytes = orjson.dumps(self.layers, option=orjson.OPT_INDENT_2 if indent is not None else 0)
+            else:
+                separators: tuple[str, str] | None = None if indent is not None else (',', ':')
+                output = json.dumps(self.layers, indent=indent, separators=separators).encode('utf-8')
+
+            with open(path, 'wb', buffering=1 << 16) as file: file.write(output) # single write of the serialized bytes
             print(f'\n{Path(path)}\nEnd of processing.')
 
         except Exception as e:
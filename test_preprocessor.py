@@ -0,0 +1,69 @@
+import json
+import os
+import tempfile
+import unittest
+
+from preprocessor import TiledPreProcessor
+
+
+class TiledPreProcessorTest(unittest.TestCase):
+
+    def _read(self, data: dict, **kwargs) -> dict:
+        with tempfile.TemporaryDirectory() as tmp:
+            path: str = os.path.join(tmp, 'map.json')
+            with open(path, 'w', encoding='utf-8') as file: json.dump(data, file)
+
+            processor = TiledPreProcessor(path, **kwargs)
+            processor.read_data_file()
+            return processor.layers
+
+    def test_spritesheet_tiles_without_image(self):
+        # Tiles of a spritesheet tileset may only carry properties, collisions or animations.
+        data: dict = {
+            'layers': [{'name': 'collisions', 'objects': [{'name': 'wall', 'width': 10, 'height': 5, 'x': 1, 'y': 2}]}],
+            'tilesets': [{'firstgid': 1, 'image': 'sheet.png', 'tiles': [{'id': 5, 'properties': [{'name': 'solid', 'type': 'bool', 'value': True}]}]}]
+        }
+
+        layers: dict = self._read(data)
+        self.assertEqual(layers, {'collisions': [{'name': 'wall', 'width': 10, 'height': 5, 'x': 1, 'y': 2}]})
+
+    def test_gid_lookup_across_tilesets(self):
+        data: dict = {
+            'layers': [{'name': 'props', 'objects': [
+                {'name': 'sprite', 'width': 16, 'height': 16, 'x': 0, 'y': 16, 'gid': 6},
+                {'name': 'tree', 'width': 32, 'height': 32, 'x': 10, 'y': 40, 'gid': 12}
+            ]}],
+            'tilesets': [
+                {'firstgid': 1, 'image': 'sheet.png', 'tiles': [{'id': 5, 'properties': []}]},
+                {'firstgid': 10, 'tiles': [{'id': 0, 'image': '../img/rock.png'}, {'id': 2, 'image': '../img/tree.png'}]}
+            ]
+        }
+
+        layers: dict = self._read(data)
+        self.assertEqual(layers, {'props': [{'x': 0, 'y': 16, 'image': None}, {'x': 10, 'y': 40, 'image': '../img/tree.png'}]})
+
+    def test_empty_file_raises_json_error(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path: str = os.path.join(tmp, 'empty.json')
+            open(path, 'wb').close()
+
+            with self.assertRaises(json.JSONDecodeError):
+                TiledPreProcessor(path).read_data_file()
+
+    def test_image_path_normalization(self):
+        data: dict = {
+            'layers': [{'name': 'props', 'objects': [
+                {'name': 'a', 'width': 16, 'height': 16, 'x': 0, 'y': 0, 'gid': 1},
+                {'name': 'b', 'width': 16, 'height': 16, 'x': 0, 'y': 0, 'gid': 2}
+            ]}],
+            'tilesets': [{'firstgid': 1, 'tiles': [{'id': 0, 'image': '../../img/./c.png'}, {'id': 1, 'image': '..\\img//win.png'}]}]
+        }
+
+        same: list[str] = [obj['image'] for obj in self._read(data)['props']]
+        relative: list[str] = [obj['image'] for obj in self._read(data, return_image_relative_path=True)['props']]
+        self.assertEqual(same, ['../../img/c.png', '../img/win.png'])
+        self.assertEqual(relative, ['img/c.png', 'img/win.png'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
-import TiledPreProcessor
+from preprocessor import TiledPreProcessor
 
 processor = TiledPreProcessor('assets/data/maps/tiled/collisions.json') # enter the relative path here
-# processor = TiledPreProcessor('assets/data/maps/tiled/collisions.json', True, Ture) # recommendation for a better approach
+# processor = TiledPreProcessor('assets/data/maps/tiled/collisions.json', True, True) # recommendation for a better approach
 processor.read_data_file()
 processor.store_data('test') # you can change the file name here
+# processor.store_data('test', indent=2) # human-readable output (compact by default)